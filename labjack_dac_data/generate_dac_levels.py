@@ -1,39 +1,180 @@
 # TODO: remove this when converting to a package
 import sys
 sys.path.append("..")
+import os
+import itertools
+import threading
 import pandas as pd
 import numpy as np
 
 import lj_helpers as ljh
 
+try:
+    # parquet output needs pyarrow, otherwise fall back to csv
+    import pyarrow
+    use_parquet = True
+except ImportError:
+    use_parquet = False
+
 save = True
-df = pd.DataFrame()
 
 handle = ljh.open_lj("T7")
 ljh.reset_dac(handle)
 
-V_steps_binary = np.arange(0, 2**16, 1)
-df["binary_input"] = V_steps_binary
+# DAC inputs are 16-bit so the binary input fits in uint16
+V_steps_binary = np.arange(0, 2**16, 1, dtype=np.uint16)
+# columns are collected here and the DataFrame is built once after all runs
+columns = {"binary_input": V_steps_binary}
+
+dac_ports = ["DAC0", "DAC1"]
+ain_ports = ["AIN0", "AIN1"]
+
+# The DAC set voltage is a linear function of the binary input through the
+# device calibration, so it is read back at both ends of the range only.
+dac_ends = [
+    ljh.ljm.eNames(
+        handle, 4, ["DAC0_BINARY", "DAC1_BINARY"] + dac_ports, [1, 1, 0, 0],
+        [1, 1, 1, 1], [binary, binary, 0, 0]
+        )[2:]
+    for binary in (V_steps_binary[0], V_steps_binary[-1])
+    ]
+dac_set = np.empty((len(V_steps_binary), len(dac_ports)), dtype=np.float32)
+for j in range(len(dac_ports)):
+    dac_set[:, j] = np.interp(
+        V_steps_binary, (V_steps_binary[0], V_steps_binary[-1]),
+        (dac_ends[0][j], dac_ends[1][j])
+        )
+ljh.reset_dac(handle)
+
+# The sweep is hardware timed with stream mode: the DAC binaries are streamed
+# out of a U16 buffer and AIN0/AIN1 streamed in on the same scan. Stream-out
+# targets come first in the scan list so each AIN reading is taken after the
+# DACs are updated. The stream-out buffer holds at most 2**13 values, so the
+# sweep is streamed in chunks.
+scan_rate = 10000
+scans_per_read = 1024
+chunk_size = 2**12
+stream_out_names = ["STREAM_OUT{0}".format(j) for j in range(len(dac_ports))]
+scan_list = ljh.ljm.namesToAddresses(
+    len(stream_out_names + ain_ports), stream_out_names + ain_ports
+    )[0]
+dac_addresses = ljh.ljm.namesToAddresses(len(dac_ports), dac_ports)[0]
+
+ljh.ljm.eWriteNames(
+    handle, 4,
+    [
+        "STREAM_SETTLING_US", "STREAM_RESOLUTION_INDEX",
+        "STREAM_CLOCK_SOURCE", "STREAM_TRIGGER_INDEX"
+        ],
+    [0, 0, 0, 0]
+    )
 
-labjack_ports = ["DAC0", "DAC1", "AIN0", "AIN1"]
+# raw AIN readings of shape (binary input, run, port), written straight to disk
+# so process_dac_levels.py can map them without parsing. Readings go to a
+# partial file, alongside the number of completed runs, which only replaces
+# the complete dataset once every run is done so a previous dataset is never
+# overwritten by an interrupted acquisition.
+raw_path = "./t7_dac_levels.npy"
+dac_set_path = "./t7_dac_set_levels.npy"
+partial_raw_path = "./t7_dac_levels.partial.npy"
+partial_dac_set_path = "./t7_dac_set_levels.partial.npy"
+partial_runs_path = "./t7_dac_levels.partial.runs"
+
+
+def save_completed_runs(num_runs):
+    """Record the number of runs completed in the partial raw file."""
+    with open(partial_runs_path + ".tmp", "w") as f:
+        f.write("{0}".format(num_runs))
+    # replaced in one step so the count is never seen half written
+    os.replace(partial_runs_path + ".tmp", partial_runs_path)
+
+
+raw_shape = (len(V_steps_binary), 10, len(ain_ports))
+if save:
+    np.save(partial_dac_set_path, dac_set)
+    raw = np.lib.format.open_memmap(
+        partial_raw_path, mode="w+", dtype=np.float32, shape=raw_shape
+        )
+    save_completed_runs(0)
+else:
+    raw = np.empty(raw_shape, dtype=np.float32)
 
 for i in range(1, 11):
-    V_save_16 = {ports: [] for ports in labjack_ports}
     print("at run no. {0}".format(i))
 
-    for binary in V_steps_binary:
-        print("step no. {0}".format(binary), end="\r")
-        ljh.ljm.eWriteName(handle, "DAC0_BINARY", binary)
-        ljh.ljm.eWriteName(handle, "DAC1_BINARY", binary)
-        
-        for ports in labjack_ports:
-            V_save_16[ports].append(ljh.ljm.eReadName(handle, ports))
-        
-    df["D0_set_output_{0}".format(i)] = V_save_16["DAC0"]
-    df["D0_actual_output_{0}".format(i)] = V_save_16["AIN0"]
-    
-    df["D1_set_output_{0}".format(i)] = V_save_16["DAC1"]
-    df["D1_actual_output_{0}".format(i)] = V_save_16["AIN1"]
+    for start in range(0, len(V_steps_binary), chunk_size):
+        print("step no. {0}".format(start), end="\r")
+        chunk = V_steps_binary[start:start + chunk_size].tolist()
+
+        for name, dac_address in zip(stream_out_names, dac_addresses):
+            # re-enabling the stream-out clears any previous buffer
+            ljh.ljm.eWriteNames(
+                handle, 4,
+                [
+                    name + "_ENABLE", name + "_TARGET",
+                    name + "_BUFFER_ALLOCATE_NUM_BYTES", name + "_ENABLE"
+                    ],
+                [0, dac_address, 2**14, 1]
+                )
+            ljh.ljm.eWriteNameArray(
+                handle, name + "_BUFFER_U16", len(chunk), chunk
+                )
+            ljh.ljm.eWriteNames(
+                handle, 2, [name + "_LOOP_SIZE", name + "_SET_LOOP"], [0, 1]
+                )
+
+        ljh.ljm.eStreamStart(
+            handle, scans_per_read, len(scan_list), scan_list, scan_rate
+            )
+        try:
+            for read_start in range(start, start + len(chunk), scans_per_read):
+                data = np.reshape(
+                    ljh.ljm.eStreamRead(handle)[0], (-1, len(scan_list))
+                    )
+                raw[read_start:read_start + len(data), i - 1] = data[
+                    :, len(stream_out_names):
+                    ]
+        finally:
+            ljh.ljm.eStreamStop(handle)
+
+    if save:
+        # completed runs are kept on disk if acquisition is interrupted
+        raw.flush()
+        save_completed_runs(i)
+
+ljh.reset_dac(handle)
+
+# columns are named run by run, D0 then D1, as process_dac_levels.py expects
+for i, j in itertools.product(range(1, 11), range(len(ain_ports))):
+    columns["D{0}_actual_output_{1}".format(j, i)] = raw[:, i - 1, j]
+
+columns["DAC0"] = dac_set[:, 0]
+columns["DAC1"] = dac_set[:, 1]
+
+df = pd.DataFrame(columns)
+
+if save:
+    # every run completed so the partial files replace the complete dataset,
+    # the memmap is closed first
+    del columns, raw
+    os.replace(partial_dac_set_path, dac_set_path)
+    os.replace(partial_raw_path, raw_path)
+    os.remove(partial_runs_path)
+
+    # the frame is written in the background while the LabJack is closed
+    if use_parquet:
+        writer = threading.Thread(
+            target=df.to_parquet, args=("./t7_dac_levels.parquet",),
+            kwargs={"compression": "zstd", "index": False}
+            )
+    else:
+        writer = threading.Thread(
+            target=df.to_csv, args=("./t7_dac_levels.csv",),
+            kwargs={"index": False}
+            )
+    writer.start()
+
+ljh.ljm.close(handle)
 
 if save:
-    df.to_csv("./t7_dac_levels.csv", index=False)
\ No newline at end of file
+    writer.join()
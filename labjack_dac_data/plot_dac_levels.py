@@ -1,12 +1,23 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 
-df = pd.read_csv("./t7_aggr_dac_levels.csv")
-
-print("minium DAC0 set {0}V and actual {1}V".format(min(df["DAC0"]), min(df["AIN0"])))
-print("maximum DAC0 set {0}V and actual {1}V".format(max(df["DAC0"]), max(df["AIN0"])))
-print("minium DAC1 set {0}V and actual {1}V".format(min(df["DAC1"]), min(df["AIN1"])))
-print("maximum DAC1 set {0}V and actual {1}V".format(max(df["DAC1"]), max(df["AIN1"])))
+try:
+    # multi-threaded csv parser, otherwise fall back to pandas
+    import pyarrow
+    csv_engine = "pyarrow"
+except ImportError:
+    csv_engine = "c"
+
+df = pd.read_csv(
+    "./t7_aggr_dac_levels.csv",
+    usecols=["binary_input", "DAC0", "DAC1", "AIN0", "AIN1"], engine=csv_engine
+    )
+limits = df[["DAC0", "AIN0", "DAC1", "AIN1"]].agg(["min", "max"])
+
+print("minium DAC0 set {0}V and actual {1}V".format(*limits.loc["min", ["DAC0", "AIN0"]]))
+print("maximum DAC0 set {0}V and actual {1}V".format(*limits.loc["max", ["DAC0", "AIN0"]]))
+print("minium DAC1 set {0}V and actual {1}V".format(*limits.loc["min", ["DAC1", "AIN1"]]))
+print("maximum DAC1 set {0}V and actual {1}V".format(*limits.loc["max", ["DAC1", "AIN1"]]))
 
 plt.close(0)
 fig, ax = plt.subplots(num=0, ncols=2, figsize=(15, 7))
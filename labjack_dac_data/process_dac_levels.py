@@ -1,34 +1,137 @@
+import os
 import numpy as np
 import pandas as pd
-from collections import Counter
 
-save = True
-df = pd.read_csv("./t7_dac_levels.csv")
+try:
+    # multi-threaded csv writer, otherwise fall back to pandas
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+
+try:
+    # compiled row mode kernel, otherwise fall back to numpy
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _row_mode_2d(a):
+        """Compiled ``row_mode`` for a 2D array, rows in parallel."""
+        out = np.empty(a.shape[0], dtype=a.dtype)
+        for i in prange(a.shape[0]):
+            best_v = a[i, 0]
+            best_c = 0
+            for j in range(a.shape[1]):
+                c = 0
+                for k in range(a.shape[1]):
+                    if a[i, k] == a[i, j]:
+                        c += 1
+                if c > best_c:
+                    best_c = c
+                    best_v = a[i, j]
+            out[i] = best_v
+        return out
+
+
+def row_mode(a):
+    """Most common value along the last axis, the first one seen on ties.
 
-all_runs = {
-    "DAC0": np.array(df[["D0_set_output_{0}".format(i) for i in range(1, 11)]]),
-    "DAC1": np.array(df[["D1_set_output_{0}".format(i) for i in range(1, 11)]]),
-    "AIN0": np.array(df[["D0_actual_output_{0}".format(i) for i in range(1, 11)]]),
-    "AIN1": np.array(df[["D1_actual_output_{0}".format(i) for i in range(1, 11)]])
-}
+    Uses a compiled kernel when numba is installed. Otherwise every sample is
+    compared with every other sample in its row, which is cheap for the 10
+    runs or 16 binary inputs reduced here.
+
+    Parameters
+    ----------
+    a : numpy.ndarray
+        Values with samples along the last axis.
+
+    Returns
+    -------
+    modes : numpy.ndarray
+        Most common values, with the last axis of ``a`` removed.
+    """
+    if njit is not None:
+        flat = np.ascontiguousarray(a).reshape(-1, a.shape[-1])
+        return _row_mode_2d(flat).reshape(a.shape[:-1])
+
+    # number of times each sample occurs in its row, argmax takes the first
+    # sample with the highest count like max(row, key=Counter(row).get)
+    counts = (a[..., :, None] == a[..., None, :]).sum(axis=-1)
+    best = np.argmax(counts, axis=-1)
+    return np.take_along_axis(a, best[..., None], axis=-1)[..., 0]
+
+
+save = True
+ain_ports = ["AIN0", "AIN1"]
 
-most_common = {key: [max(arr, key=Counter(arr).get) for arr in all_runs[key]] for key in all_runs.keys()}
+if os.path.exists("./t7_dac_levels.npy") or os.path.exists(
+        "./t7_dac_levels.partial.npy"):
+    if os.path.exists("./t7_dac_levels.npy"):
+        # raw AIN readings of shape (binary input, run, port) saved by
+        # generate_dac_levels.py, indexed per port without copying
+        raw = np.load("./t7_dac_levels.npy", mmap_mode="r")
+        dac_set = np.load("./t7_dac_set_levels.npy")
+    else:
+        # interrupted acquisition, only the completed runs are used as the
+        # rest of the file is unwritten
+        with open("./t7_dac_levels.partial.runs") as f:
+            num_runs = int(f.read())
+        if num_runs == 0:
+            raise ValueError(
+                "No runs of the interrupted acquisition completed."
+                )
+        print("Acquisition was interrupted, using {0} completed runs.".format(
+            num_runs
+            ))
+        raw = np.load(
+            "./t7_dac_levels.partial.npy", mmap_mode="r"
+            )[:, :num_runs]
+        dac_set = np.load("./t7_dac_set_levels.partial.npy")
+    binary_input = np.arange(0, 2**16, 1, dtype=np.uint16)
+    dac_levels = {"DAC0": dac_set[:, 0], "DAC1": dac_set[:, 1]}
+else:
+    if os.path.exists("./t7_dac_levels.parquet"):
+        df = pd.read_parquet("./t7_dac_levels.parquet")
+    else:
+        # readings are float32 at acquisition, binary input is 16-bit
+        df = pd.read_csv("./t7_dac_levels.csv", dtype=np.float32).astype(
+            {"binary_input": np.uint16}
+            )
 
-binary_df = pd.DataFrame(df["binary_input"])
+    binary_input = df["binary_input"]
+    dac_levels = {"DAC0": df["DAC0"], "DAC1": df["DAC1"]}
+    # columns are saved run by run as D0 then D1, so a single copy reshapes
+    # into the same (binary input, run, port) layout as the memmap
+    raw = df.filter(regex=r"^D[01]_actual_output_").to_numpy(
+        dtype=np.float32
+        ).reshape(-1, 10, len(ain_ports))
 
-for key in most_common.keys():
-    binary_df[key] = most_common[key]
+all_runs = {port: raw[:, :, j] for j, port in enumerate(ain_ports)}
 
-df_12bit = pd.DataFrame(index=np.arange(2**12))
-df_12bit["AIN0"] = None
-df_12bit["AIN1"] = None
+most_common = {}
+levels_12bit = {}
+for key in all_runs.keys():
+    # most common value across all runs, viewed as (12-bit level, 16 binary
+    # inputs, run) so both reductions are taken from the same pass
+    run_modes = row_mode(all_runs[key].reshape(2**12, 16, -1))
+    most_common[key] = run_modes.ravel()
+    # obtaining most common voltage value in each set of 16 binary inputs
+    levels_12bit[key] = row_mode(run_modes)
 
-# obtaining most common voltage value in the set 
-for i in range(0, len(binary_df), 16):
-    df_12bit["AIN0"][int(i/16)] = max(binary_df["AIN0"][i:i+16], key=Counter(binary_df["AIN0"][i:i+16]).get)
-    df_12bit["AIN1"][int(i/16)] = max(binary_df["AIN1"][i:i+16], key=Counter(binary_df["AIN1"][i:i+16]).get)
+binary_df = pd.DataFrame(
+    {"binary_input": binary_input, **dac_levels, **most_common}
+    )
+df_12bit = pd.DataFrame(levels_12bit)
 
 
 if save:
-    binary_df.to_csv("./t7_aggr_dac_levels.csv", index=False)
-    df_12bit.to_csv("./t7_12bit_dac_levels.csv", index=False)
\ No newline at end of file
+    for out_df, path in [
+            (binary_df, "./t7_aggr_dac_levels.csv"),
+            (df_12bit, "./t7_12bit_dac_levels.csv")]:
+        if pacsv is not None:
+            pacsv.write_csv(pa.Table.from_pandas(out_df, preserve_index=False), path)
+        else:
+            out_df.to_csv(path, index=False)
\ No newline at end of file
@@ -4,9 +4,45 @@
 
 import numpy as np
 import time
-from random import randint
+import itertools
+import collections
+import functools
+import ctypes
 from labjack import ljm
 
+try:
+    # LJM C library behind the Python wrapper, used to pass preallocated
+    # buffers directly
+    from labjack.ljm.ljm import _staticLib as _ljm_lib
+except ImportError:
+    _ljm_lib = None
+
+STREAM_RESET_NAMES = (
+    "STREAM_SETTLING_US", "STREAM_RESOLUTION_INDEX", "STREAM_CLOCK_SOURCE",
+    "STREAM_TRIGGER_INDEX"
+    )
+"""Stream configuration registers reset by ``Streamer.reset_stream``."""
+STREAM_RESET_DATAS = (0, 0, 0, 0)
+"""Default values written to ``STREAM_RESET_NAMES``."""
+
+ASYNCH_CONFIG_NAMES = (
+    "ASYNCH_TX_DIONUM", "ASYNCH_RX_DIONUM", "ASYNCH_BAUD",
+    "ASYNCH_RX_BUFFER_SIZE_BYTES", "ASYNCH_NUM_DATA_BITS",
+    "ASYNCH_NUM_STOP_BITS", "ASYNCH_PARITY"
+    )
+"""Asynch configuration registers, in the order of the arguments of
+``AsynchUpdater.init_asynch``."""
+ASYNCH_CONFIGS = {
+    "reflow":       (5, 4, 9600, 6, 0, 1, 0),
+    "machining":    (1, 0, 9600, 6, 0, 1, 0)
+}
+"""Values of ``ASYNCH_CONFIG_NAMES`` for each experiment."""
+ASYNCH_TX_NAMES = ("ASYNCH_NUM_BYTES_TX", "ASYNCH_DATA_TX", "ASYNCH_TX_GO")
+"""Asynch registers written by ``AsynchUpdater.transmit``, in order."""
+ASYNCH_RX_NAMES = ("ASYNCH_NUM_BYTES_RX", "ASYNCH_DATA_RX")
+"""Asynch registers read by ``AsynchUpdater.receive``, in order."""
+
+
 def convert_input(val):
     """Convert single length input to iterable (``list`` or ``tuple``).
 
@@ -20,15 +56,45 @@ def convert_input(val):
     iter_val : ``list`` or ``tuple``
         Iterable output.
     """
-    if not isinstance(val, tuple) and not isinstance(val, list):
-        if isinstance(val, np.ndarray):
-            # np.ndarray can only be converted to list this way
-            iter_val = list(val)
-        else:
-            # any other variable needs this way
-            iter_val = [val]
-    else:
+    val_type = type(val)
+    if val_type is list or val_type is tuple:
         iter_val = val
+    elif isinstance(val, np.ndarray):
+        # tolist converts in C rather than boxing each element one by one
+        iter_val = val.tolist()
+    else:
+        # any other variable needs this way
+        iter_val = [val]
+    return iter_val
+
+
+def convert_input_checked(val, expected_len: int):
+    """Convert input to iterable and check its length, see ``convert_input``.
+
+    Parameters
+    ----------
+    val : any type
+        Can be ``list``, ``tuple``, ``numpy.ndarray`` or any type.
+    expected_len : int
+        Required length of the iterable output.
+
+    Returns
+    -------
+    iter_val : ``list`` or ``tuple``
+        Iterable output.
+
+    Raises
+    ------
+    ValueError
+        Length of the iterable output doesn't match the expected length.
+    """
+    iter_val = convert_input(val)
+    if len(iter_val) != expected_len:
+        raise ValueError(
+            "Length of data ({0}) doesn't match number of registers ({1})".format(
+                len(iter_val), expected_len
+                )
+            )
     return iter_val
 
 
@@ -113,9 +179,12 @@ class LabJackDaq:
         """Add a ``AsynchUpdater``, refer to the class for more info."""
         self.asynch = AsynchUpdater.experiment(self.handle, exp_name=exp_name)
 
-    def add_interval(self, interval_time: float, num_iter: int):
+    def add_interval(
+        self, interval_time: float, num_iter: int, max_responses: int=None):
         """Add a ``Intervaler``, refer to the class for more info."""
-        self.interval = Intervaler(interval_time, num_iter)
+        self.interval = Intervaler(
+            interval_time, num_iter, max_responses=max_responses
+            )
 
 
 class Updater:
@@ -139,18 +208,90 @@ class Updater:
         self._handle = handle
 
         self.write_names = convert_input(write_names)
-        self.read_names = convert_input(read_names)
+        # read names never change so are kept immutable
+        self.read_names = tuple(convert_input(read_names))
+
+        # Register names are fixed so the lengths and whether the read and
+        # write registers are the same are only worked out once
+        self._n_write = len(self.write_names)
+        self._n_read = len(self.read_names)
+        self._same_registers = set(self.write_names) == set(self.read_names)
+
+        # Registers are resolved to addresses once so LJM doesn't look up
+        # their names on every call
+        self._write_addresses, self._write_types = ljm.namesToAddresses(
+            self._n_write, list(self.write_names)
+            )
+        self._read_addresses, self._read_types = ljm.namesToAddresses(
+            self._n_read, list(self.read_names)
+            )
+
+        # Write registers of the same type at consecutive addresses, in
+        # order, such as DAC0 and DAC1, are written as a single array frame.
+        # UINT16 registers are 1 Modbus register wide, all others are 2
+        write_start = self._write_addresses[0] if self._n_write else None
+        write_type = self._write_types[0] if self._n_write else None
+        reg_width = 1 if write_type == ljm.constants.UINT16 else 2
+        self._contiguous_write = self._n_write > 1 and all(
+            reg_type == write_type and address == write_start + i*reg_width
+            for i, (address, reg_type) in enumerate(
+                zip(self._write_addresses, self._write_types)
+                )
+            )
+
+        # LJM calls are bound once with their fixed arguments so only the
+        # data is passed on every call
+        if self._contiguous_write:
+            self._do_write = functools.partial(
+                ljm.eWriteAddressArray, self._handle, write_start, write_type,
+                self._n_write
+                )
+            write_frames = ([write_start], [write_type], [self._n_write])
+        else:
+            self._do_write = functools.partial(
+                ljm.eWriteAddresses, self._handle, self._n_write,
+                self._write_addresses, self._write_types
+                )
+            write_frames = (
+                list(self._write_addresses), list(self._write_types),
+                [1]*self._n_write
+                )
+        self._do_read = functools.partial(
+            ljm.eReadAddresses, self._handle, self._n_read,
+            self._read_addresses, self._read_types
+            )
+        # eAddresses frames to write and then read registers in a single
+        # transaction
+        num_write_frames = len(write_frames[0])
+        self._do_update = functools.partial(
+            ljm.eAddresses, self._handle, num_write_frames + self._n_read,
+            write_frames[0] + list(self._read_addresses),
+            write_frames[1] + list(self._read_types),
+            [1]*num_write_frames + [0]*self._n_read,
+            write_frames[2] + [1]*self._n_read
+            )
+        self._read_values = [0]*self._n_read
+
+        if _ljm_lib is not None:
+            # C arrays for read are built once instead of on every call
+            self._c_read_addresses = (ctypes.c_int32*self._n_read)(
+                *self._read_addresses
+                )
+            self._c_read_types = (ctypes.c_int32*self._n_read)(
+                *self._read_types
+                )
+            self._c_read_values = (ctypes.c_double*self._n_read)()
+            self._c_error_address = ctypes.c_int32(0)
 
     @classmethod
-    def same_registers(cls, handle: int, reg_names):
+    def with_same_registers(cls, handle: int, reg_names):
         """Inits an Updater object with the same read and write registers."""
         return cls(handle, reg_names, reg_names)
 
     @property
     def same_registers(self) -> bool:
         """Checks if the read and write registers are the same."""
-        same = set(self.write_names) == set(self.read_names)
-        return same
+        return self._same_registers
 
     def read(self) -> dict:
         """Read from Labjack registers.
@@ -160,14 +301,42 @@ class Updater:
         read_dict : dict
             Dict in the format ``{register_name : data}``.
         """
-        read_data = ljm.eReadNames(
-            self._handle, len(self.read_names), self.read_names
-            )
-        read_dict = {
-            name: data for name, data in zip(self.read_names, read_data)
-            }
+        read_dict = dict(zip(self.read_names, self._read_data()))
         return read_dict
 
+    def read_into(self, out_dict: dict) -> dict:
+        """Read from Labjack registers into an existing dict.
+
+        Avoids creating a new dict on every read in tight loops.
+
+        Parameters
+        ----------
+        out_dict : dict
+            Dict updated in place in the format ``{register_name : data}``.
+
+        Returns
+        -------
+        out_dict : dict
+            The same dict that was passed in.
+        """
+        out_dict.update(zip(self.read_names, self._read_data()))
+        return out_dict
+
+    def _read_data(self) -> list:
+        """Read from Labjack registers, in the order of ``read_names``."""
+        if _ljm_lib is None:
+            read_data = self._do_read()
+        else:
+            error = _ljm_lib.LJM_eReadAddresses(
+                self._handle, self._n_read, self._c_read_addresses,
+                self._c_read_types, self._c_read_values,
+                ctypes.byref(self._c_error_address)
+                )
+            if error != ljm.errorcodes.NOERROR:
+                raise ljm.LJMError(error, self._c_error_address.value)
+            read_data = self._c_read_values[:]
+        return read_data
+
     def write(self, datas):
         """Write to Labjack registers with input data.
 
@@ -176,14 +345,9 @@ class Updater:
         datas : tuple, list or anything
         """
         # Single-valued data is converted into a list
-        iter_datas = convert_input(datas)
+        iter_datas = convert_input_checked(datas, self._n_write)
 
-        if len(iter_datas) != len(self.write_names):
-            raise ValueError
-
-        ljm.eWriteNames(
-            self._handle, len(self.write_names), self.write_names, iter_datas
-            )
+        self._do_write(iter_datas)
 
     def update(self, datas) -> dict:
         """Write to and read from Labjack.
@@ -206,28 +370,14 @@ class Updater:
         ValueError
             Length of data to write doesn't match number of write registers.
         """
-        # ljm.eReadNames only works with list/tuple names so must be converted
-        iter_datas = convert_input(datas)
-
-        if len(iter_datas) != len(self.write_names):
-            raise ValueError(
-                "Length of data to write doesn't match number of write registers"
-                )
-
-        ljm.eWriteNames(
-            self._handle, len(self.write_names), self.write_names, iter_datas
-            )
+        # Single-valued data is converted into a list
+        iter_datas = convert_input_checked(datas, self._n_write)
 
-        if self.same_registers:
-            # Read the same registers after writing to them.
-            read_data = ljm.eReadNames(
-                self._handle, len(self.write_names), self.write_names
-                )
-            read_dict = {
-                name: data for name, data in zip(self.write_names, read_data)
-                }
-        else:
-            read_dict = self.read()
+        # Write and then read registers in one transaction, which are read
+        # after being written to if they are the same registers. The first
+        # results are the written values
+        results = self._do_update(list(iter_datas) + self._read_values)
+        read_dict = dict(zip(self.read_names, results[self._n_write:]))
 
         return read_dict
 
@@ -271,18 +421,15 @@ class AsynchUpdater:
     def __init__(self, handle: int):
         """Inits an AsynchUpdater object."""
         self._handle = handle
-        self._last_host_tick = ljm.getHostTick()
-
-        # if experiment in ASYNCH_CONFIG_REGISTERS.keys():
-        #     self.experiment = experiment
-        # else:
-        #     raise ValueError("Experiment '{0}' doesn't exist! Please choose '{1}' or '{2}'".format(experiment, *ASYNCH_CONFIG_REGISTERS.keys()))
-
-    @property
-    def _asynch_enabled(self) -> bool:
-        """Return if asynch communications is enabled."""
-        enabled = bool(ljm.eReadName(self._handle, "ASYNCH_ENABLE"))
-        return enabled
+        self._last_t_ns = time.monotonic_ns()
+        # transmit and receive registers are resolved once so LJM doesn't look
+        # up their names on every action
+        self._tx_addresses, self._tx_types = ljm.namesToAddresses(
+            len(ASYNCH_TX_NAMES), ASYNCH_TX_NAMES
+            )
+        self._rx_addresses, self._rx_types = ljm.namesToAddresses(
+            len(ASYNCH_RX_NAMES), ASYNCH_RX_NAMES
+            )
 
     @classmethod
     def experiment(cls, handle: int, exp_name: str):
@@ -294,31 +441,13 @@ class AsynchUpdater:
             Must be either "reflow" or "machining", to set which registers are
             used for Asynch communication.
         """
+        try:
+            asynch_conf = ASYNCH_CONFIGS[exp_name]
+        except KeyError:
+            raise ValueError("Experiment '{0}' doesn't exist!".format(exp_name))
+
         au = cls(handle)
-        if exp_name == "reflow":
-            reflow_asynch_conf = {
-                "tx":               5,
-                "rx":               4,
-                "baud":             9600,
-                "rx_buffer":        6,
-                "num_data_bits":    0,
-                "num_stop_bits":    1,
-                "parity":           0
-            }
-            au.init_asynch(**reflow_asynch_conf)
-        elif exp_name == "machining":
-            machine_asynch_conf = {
-                "tx":               1,
-                "rx":               0,
-                "baud":             9600,
-                "rx_buffer":        6,
-                "num_data_bits":    0,
-                "num_stop_bits":    1,
-                "parity":           0
-            }
-            au.init_asynch(**machine_asynch_conf)
-        else:
-            raise ValueError("Experiment '{0}' doesn't exist!")
+        au.init_asynch(*asynch_conf)
         return au
 
     @classmethod
@@ -341,9 +470,10 @@ class AsynchUpdater:
 
     def _check_interval(self):
         """Check interval time between two asynch actions is greater than 50ms."""
-        # TODO: needs sleep here?
-        if (ljm.getHostTick() - self._last_host_tick) < self.min_time_interval:
-            time.sleep(self.min_time_interval/1e6)
+        # host clock only, no need to go through LJM
+        elapsed = (time.monotonic_ns() - self._last_t_ns)/1e3
+        if elapsed < self.min_time_interval:
+            time.sleep((self.min_time_interval - elapsed)/1e6)
 
     def init_asynch(
         self, tx: int=0, rx: int=0, baud: int=0, rx_buffer: int=0,
@@ -380,58 +510,73 @@ class AsynchUpdater:
             2 = even.
         """
 
-        if self._asynch_enabled:
-            ljm.eWriteName(self._handle, "ASYNCH_ENABLE", 0)
-
-        ljm.eWriteName(self._handle, "ASYNCH_TX_DIONUM", tx)
-        ljm.eWriteName(self._handle, "ASYNCH_RX_DIONUM", rx)
-        ljm.eWriteName(self._handle, "ASYNCH_BAUD", baud)
-        ljm.eWriteName(self._handle, "ASYNCH_RX_BUFFER_SIZE_BYTES", rx_buffer)
-        ljm.eWriteName(self._handle, "ASYNCH_NUM_DATA_BITS", num_data_bits)
-        ljm.eWriteName(self._handle, "ASYNCH_NUM_STOP_BITS", num_stop_bits)
-        ljm.eWriteName(self._handle, "ASYNCH_PARITY", parity)
-        # Turn on Asynch communication
-        ljm.eWriteName(self._handle, "ASYNCH_ENABLE", 1)
+        # All configuration registers are written in a single transaction.
+        # Asynch must be turned off first to be configured, which is written
+        # regardless as it is cheaper than reading ASYNCH_ENABLE first, and is
+        # turned on at the end
+        reg_names = ("ASYNCH_ENABLE",) + ASYNCH_CONFIG_NAMES + ("ASYNCH_ENABLE",)
+        reg_datas = [
+            0, tx, rx, baud, rx_buffer, num_data_bits, num_stop_bits, parity, 1
+            ]
 
-        # reg_names = [key for key in ASYNCH_CONFIG_REGISTERS[self.experiment].keys()]
-        # reg_datas = [val for val in ASYNCH_CONFIG_REGISTERS[self.experiment].values()]
-        # ljm.eWriteNames(self._handle, len(reg_names), reg_names, reg_datas)
+        ljm.eWriteNames(self._handle, len(reg_names), reg_names, reg_datas)
 
         print("Initialisation of Asynch comms. successful!")
 
-    def transmit(self, data: list):
+    def transmit(self, data):
         """Asynchronously transmit serial data to device via LabJack TX line.
 
         Parameters
         ----------
-        data : list
-            List containing serial frame message.
-
-        TODO: check if tuple, list works - then can use same function from
-        Updater
+        data : list, tuple, bytes, bytearray or numpy.ndarray
+            Serial frame message, any sequence of byte values.
+            ``numpy.ndarray`` is converted to a list once before being passed
+            to LJM.
         """
+        if isinstance(data, np.ndarray):
+            data = data.tolist()
+        else:
+            # bytes and bytearray become a list of byte values
+            data = list(data)
         self._check_interval()
-        ljm.eWriteName(self._handle, "ASYNCH_NUM_BYTES_TX", len(data))
-        ljm.eWriteNameArray(self._handle, "ASYNCH_DATA_TX", len(data), data)
-        # Initiate a transmission via the buffer
-        ljm.eWriteName(self._handle, "ASYNCH_TX_GO", 1)
+        num_bytes = len(data)
+        # Number of bytes, data array and initiating a transmission via the
+        # buffer (ASYNCH_TX_GO) are written in a single transaction
+        ljm.eAddresses(
+            self._handle, 3, self._tx_addresses, self._tx_types, [1, 1, 1],
+            [1, num_bytes, 1], [num_bytes] + data + [1]
+            )
 
-        self._last_host_tick = ljm.getHostTick()
+        self._last_t_ns = time.monotonic_ns()
 
-    def receive(self) -> list:
+    def receive(self, as_array: bool=False):
         """Asynchronously receive serial data from device via LabJack RX line.
 
+        Parameters
+        ----------
+        as_array : bool, optional
+            Return the response as a ``numpy.ndarray`` of ``numpy.uint8``
+            for further processing with numpy, by default False.
+
         Returns
         -------
-        asynch_rx_vals : list
+        asynch_rx_vals : list or numpy.ndarray
             Asynch response from device via LabJack RX line.
         """
         self._check_interval()
-        num_rx_vals = int(ljm.eReadName(self._handle, "ASYNCH_NUM_BYTES_RX"))
-        asynch_rx_vals = ljm.eReadNameArray(
-            self._handle, "ASYNCH_DATA_RX", num_rx_vals
+        # Reading ASYNCH_DATA_RX removes bytes from the receive buffer, so
+        # only the number of bytes already received is read
+        num_rx_vals = int(ljm.eReadAddress(
+            self._handle, self._rx_addresses[0], self._rx_types[0]
+            ))
+        asynch_rx_vals = ljm.eReadAddressArray(
+            self._handle, self._rx_addresses[1], self._rx_types[1],
+            num_rx_vals
             )
-        self._last_host_tick = ljm.getHostTick()
+        self._last_t_ns = time.monotonic_ns()
+
+        if as_array:
+            asynch_rx_vals = np.asarray(asynch_rx_vals, dtype=np.uint8)
         return asynch_rx_vals
 
 
@@ -449,6 +594,9 @@ class Intervaler:
         Time of each iteration of the interval in μs.
     num_iter : int
         Number of iterations.
+    max_responses : int, optional
+        Maximum number of responses kept, once reached the oldest responses
+        are dropped, by default None to keep every response.
 
     Notes
     -----
@@ -457,34 +605,34 @@ class Intervaler:
 
     TODO: LUA scripting instead
     """
+    _next_handle = itertools.count(1)
+    """Counter giving each Intervaler a unique interval handle."""
 
-    def __init__(self, interval_time: float, num_iter: int):
+    def __init__(
+        self, interval_time: float, num_iter: int, max_responses: int=None):
         """Inits an Intervaler object."""
         # each interval has its own handle as well
-        self._interval_handle = randint(1, 999)
+        self._interval_handle = next(Intervaler._next_handle)
         self.interval_time = interval_time
         self.num_iter = num_iter
+        self.max_responses = max_responses
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, exc_tb):
-        ljm.cleanInterval(self._interval_handle)
+        try:
+            ljm.cleanInterval(self._interval_handle)
+        except ljm.LJMError as e:
+            # interval was never started or already cleaned
+            if e.errorCode != ljm.errorcodes.INVALID_INTERVAL_HANDLE:
+                raise
         if exc_type is KeyboardInterrupt:
             print("Interval stopped by user.")
             return False
 
         return exc_type is None
 
-    @staticmethod
-    def _add_responses(resp_list: list, resp) -> list:
-        """Either add or concatenate responses."""
-        if isinstance(resp, list):
-            resp_list += resp
-        elif resp != "":
-            resp_list.append(resp)
-        return resp_list
-
     def start_interval(
         self, operations_inside, operations_outside=None,
         **operation_kwargs) -> dict:
@@ -497,7 +645,8 @@ class Intervaler:
         and must return
             - curr_iter as an argument (curr_iter must be incremented within
             operations_inside otherwise an infinite loop will occur
-            - any read data (can be an empty string).
+            - any read data, ideally as a list of responses (any other
+            response is wrapped in a list and an empty string is ignored).
 
         Parameters
         ----------
@@ -517,55 +666,160 @@ class Intervaler:
             any responses from the LabJack.
         """
         with self:
-            curr_iter = 0
-            all_interval_t = []
-            interval_responses = []
             ljm.startInterval(self._interval_handle, self.interval_time)
-            t_before_loop = ljm.getHostTick()
-
-            while curr_iter < self.num_iter:
-                t_start_interval = ljm.getHostTick()
-                # run the operation inside a loop, allowing operation to
-                # change iteration number
-                curr_iter, resp = operations_inside(
-                    curr_iter, **operation_kwargs
+            # intervals are timed on the host clock, without going through
+            # LJM, in ns
+            t_before_loop = time.perf_counter_ns()
+
+            # the loop is chosen once rather than checking for
+            # operations_outside every iteration
+            if operations_outside is None:
+                all_interval_t, interval_responses = self._loop_without_outside(
+                    operations_inside, operation_kwargs
                     )
-                skipped = ljm.waitForNextInterval(self._interval_handle)
-                t_end_interval = ljm.getHostTick()
-
-                interval_responses = self._add_responses(
-                    interval_responses, resp
+            else:
+                all_interval_t, interval_responses = self._loop_with_outside(
+                    operations_inside, operations_outside, operation_kwargs
                     )
-                all_interval_t.append(t_end_interval - t_start_interval)
-
-                if operations_outside != None:
-                    # operations outside of the timed loop, called
-                    # *immediately* after the timed interval has ended
-                    dummy_iter, resp = operations_outside(
-                        curr_iter, **operation_kwargs
-                        )
 
-                    interval_responses = self._add_responses(
-                        interval_responses, resp
-                        )
-
-                if skipped > 0:
-                    print("Iteration {0} skipped intervals: {1}".format(
-                        curr_iter, skipped
-                        ))
-
-            total_time = ljm.getHostTick() - t_before_loop
-            # Context manager handles cleaning the interval already
-            # ljm.cleanInterval(self._interval_handle)
+            total_time = (time.perf_counter_ns() - t_before_loop) // 1000
 
             response = {
                 "interval_time": np.mean(all_interval_t),
                 "total_time": total_time,
-                "response": interval_responses
+                "response": list(interval_responses)
             }
 
             return response
 
+    def _loop_without_outside(
+        self, operations_inside, operation_kwargs: dict) -> tuple:
+        """Timed interval loop with only operations inside the interval.
+
+        Returns
+        -------
+        all_interval_t : numpy.ndarray
+            Time of each interval in μs.
+        interval_responses : collections.deque
+            Responses from the operations.
+        """
+        # local names avoid attribute lookups on every iteration
+        perf_counter_ns = time.perf_counter_ns
+        wait_for_next_interval = ljm.waitForNextInterval
+        interval_handle = self._interval_handle
+
+        curr_iter = 0
+        # curr_iter is changed by operations_inside so intervals are
+        # counted separately
+        num_intervals = 0
+        all_interval_t = np.empty(self.num_iter, dtype=np.int64)
+        # deque appends never reallocate, unlike a growing list, and bound
+        # memory use for long runs if max_responses is set
+        interval_responses = collections.deque(maxlen=self.max_responses)
+        extend_responses = interval_responses.extend
+        append_response = interval_responses.append
+
+        while curr_iter < self.num_iter:
+            t_start_interval = perf_counter_ns()
+            # run the operation inside a loop, allowing operation to
+            # change iteration number
+            curr_iter, resp = operations_inside(curr_iter, **operation_kwargs)
+            skipped = wait_for_next_interval(interval_handle)
+            t_end_interval = perf_counter_ns()
+
+            # a list response is added as is, an empty string is ignored and
+            # any other response is added as a single response
+            if isinstance(resp, list):
+                extend_responses(resp)
+            elif resp != "":
+                append_response(resp)
+            if num_intervals == len(all_interval_t):
+                # more intervals than expected if curr_iter isn't
+                # incremented every interval
+                all_interval_t = np.concatenate(
+                    (all_interval_t, np.empty_like(all_interval_t))
+                    )
+            all_interval_t[num_intervals] = t_end_interval - t_start_interval
+            num_intervals += 1
+
+            if skipped > 0:
+                print("Iteration {0} skipped intervals: {1}".format(
+                    curr_iter, skipped
+                    ))
+
+        # interval times are converted from ns to μs all at once
+        return all_interval_t[:num_intervals] // 1000, interval_responses
+
+    def _loop_with_outside(
+        self, operations_inside, operations_outside,
+        operation_kwargs: dict) -> tuple:
+        """Timed interval loop with operations inside and outside the interval.
+
+        Returns
+        -------
+        all_interval_t : numpy.ndarray
+            Time of each interval in μs.
+        interval_responses : collections.deque
+            Responses from the operations.
+        """
+        # local names avoid attribute lookups on every iteration
+        perf_counter_ns = time.perf_counter_ns
+        wait_for_next_interval = ljm.waitForNextInterval
+        interval_handle = self._interval_handle
+
+        curr_iter = 0
+        # curr_iter is changed by operations_inside so intervals are
+        # counted separately
+        num_intervals = 0
+        all_interval_t = np.empty(self.num_iter, dtype=np.int64)
+        # deque appends never reallocate, unlike a growing list, and bound
+        # memory use for long runs if max_responses is set
+        interval_responses = collections.deque(maxlen=self.max_responses)
+        extend_responses = interval_responses.extend
+        append_response = interval_responses.append
+
+        while curr_iter < self.num_iter:
+            t_start_interval = perf_counter_ns()
+            # run the operation inside a loop, allowing operation to
+            # change iteration number
+            curr_iter, resp = operations_inside(curr_iter, **operation_kwargs)
+            skipped = wait_for_next_interval(interval_handle)
+            t_end_interval = perf_counter_ns()
+
+            # a list response is added as is, an empty string is ignored and
+            # any other response is added as a single response
+            if isinstance(resp, list):
+                extend_responses(resp)
+            elif resp != "":
+                append_response(resp)
+            if num_intervals == len(all_interval_t):
+                # more intervals than expected if curr_iter isn't
+                # incremented every interval
+                all_interval_t = np.concatenate(
+                    (all_interval_t, np.empty_like(all_interval_t))
+                    )
+            all_interval_t[num_intervals] = t_end_interval - t_start_interval
+            num_intervals += 1
+
+            # operations outside of the timed loop, called *immediately*
+            # after the timed interval has ended
+            dummy_iter, resp = operations_outside(
+                curr_iter, **operation_kwargs
+                )
+            if isinstance(resp, list):
+                extend_responses(resp)
+            elif resp != "":
+                append_response(resp)
+
+            if skipped > 0:
+                print("Iteration {0} skipped intervals: {1}".format(
+                    curr_iter, skipped
+                    ))
+
+        # interval times are converted from ns to μs all at once
+        return all_interval_t[:num_intervals] // 1000, interval_responses
+
+
 class Streamer:
     """Streaming data from buffer to output mode via the LabJack.
 
@@ -591,17 +845,66 @@ class Streamer:
 
         self.out_names = convert_input(out_names)
         self.in_names = in_names    # Not yet implemented
+        # set when data is loaded in
+        self._data_lengths = []
+        self._max_data_length = 0
+        # set by prepare
+        self._desired_scan_rate = None
+        # whether a stream has been started and not yet stopped
+        self._started = False
+
+        # out_names are fixed so register numbers and addresses are only
+        # looked up once
+        self._stream_nums = [
+            "{0}".format(no) for no in range(len(self.out_names))
+            ]
+        # targets and their STREAM_OUT registers are resolved in one lookup
+        num_outs = len(self.out_names)
+        addresses = ljm.namesToAddresses(
+            2*num_outs,
+            list(self.out_names) + [
+                "STREAM_OUT{0}".format(num) for num in self._stream_nums
+                ]
+            )[0]
+        self._out_addresses = list(addresses[:num_outs])
+        self._scan_list = list(addresses[num_outs:])
+        # register names of each stream-out target, in stream number order
+        self._reg_names = {
+            key: [
+                "STREAM_OUT{0}_{1}".format(num, suffix)
+                for num in self._stream_nums
+                ]
+            for key, suffix in [
+                ("buffer_alloc", "BUFFER_ALLOCATE_NUM_BYTES"),
+                ("target", "TARGET"),
+                ("enable", "ENABLE"),
+                ("loop_size", "LOOP_SIZE"),
+                ("set_loop", "SET_LOOP"),
+                ("buffer_u16", "BUFFER_U16"),
+                ("buffer_f32", "BUFFER_F32"),
+                ("buffer_status", "BUFFER_STATUS")
+                ]
+            }
+        # configure_stream always writes the same registers, interleaved per
+        # stream-out target, so only their values change between calls
+        self._config_names = [
+            self._reg_names[key][i]
+            for i in range(len(self._stream_nums))
+            for key in [
+                "buffer_alloc", "target", "enable", "loop_size", "set_loop"
+                ]
+            ]
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, exc_tb):
-        for stream_num in self.stream_nums:
-            ljm.eWriteName(
-                self._handle, "STREAM_OUT{0}_ENABLE".format(stream_num), 1
-                )
+        if self._started:
+            # nothing to stop if the stream never started
+            for enable_name in self._reg_names["enable"]:
+                ljm.eWriteName(self._handle, enable_name, 1)
 
-        self.stop_stream()
+            self.stop_stream()
 
         if exc_type is KeyboardInterrupt:
             print("Streaming stopped by user.")
@@ -619,24 +922,17 @@ class Streamer:
     @property
     def out_addresses(self) -> list:
         """Return a list of addresses for stream-out targets."""
-        out_address = [
-            ljm.nameToAddress(out_name)[0] for out_name in self.out_names]
-        return out_address
+        return self._out_addresses
 
     @property
     def stream_nums(self) -> list:
         """Return a list of numbers corresponding to stream-out targets."""
-        nums = ["{0}".format(no) for no in range(len(self.out_names))]
-        return nums
+        return self._stream_nums
 
     @property
     def scan_list(self) -> list:
         """Return a list of stream-out targets for a single scan."""
-        scan_list = [
-            ljm.nameToAddress("STREAM_OUT{0}".format(num))[0]
-            for num in self.stream_nums
-            ]
-        return scan_list
+        return self._scan_list
 
     def reset_stream(self):
         """Reset stream configurations for purely stream-out.
@@ -653,10 +949,10 @@ class Streamer:
         """
         self.stop_stream()
 
-        ljm.eWriteName(self._handle, "STREAM_SETTLING_US", 0)
-        ljm.eWriteName(self._handle, "STREAM_RESOLUTION_INDEX", 0)
-        ljm.eWriteName(self._handle, "STREAM_CLOCK_SOURCE", 0)
-        ljm.eWriteName(self._handle, "STREAM_TRIGGER_INDEX", 0)
+        ljm.eWriteNames(
+            self._handle, len(STREAM_RESET_NAMES), STREAM_RESET_NAMES,
+            STREAM_RESET_DATAS
+            )
 
     def configure_stream(self, loop_num_vals: int=0):
         """Configure stream-out buffer size and target and update buffer.
@@ -680,28 +976,18 @@ class Streamer:
         -----
         Section 2 and 3 on LabJack T-series datasheets.
         """
-        for stream_num, out_address in zip(self.stream_nums, self.out_addresses):
-            ljm.eWriteName(
-                self._handle,
-                "STREAM_OUT{0}_BUFFER_ALLOCATE_NUM_BYTES".format(
-                    stream_num), 2**14
-                )
-            ljm.eWriteName(
-                self._handle,
-                "STREAM_OUT{0}_TARGET".format(stream_num), out_address
-                )
-            ljm.eWriteName(
-                self._handle, "STREAM_OUT{0}_ENABLE".format(stream_num), 1
-                )
-            # Update Buffer
-            ljm.eWriteName(
-                self._handle,
-                "STREAM_OUT{0}_LOOP_SIZE".format(stream_num), loop_num_vals
-                )
-            # This register is an alias for STREAM_OUT{0}_LOOP_NUM_VALUES
-            ljm.eWriteName(
-                self._handle, "STREAM_OUT{0}_SET_LOOP".format(stream_num), 1
-                )
+        # Registers for all stream-out targets are written in one transaction,
+        # values follow the order of self._config_names: buffer size, target,
+        # enable, loop size and set loop (alias for
+        # STREAM_OUT{0}_LOOP_NUM_VALUES)
+        reg_datas = []
+        for out_address in self._out_addresses:
+            reg_datas += [2**14, out_address, 1, loop_num_vals, 1]
+
+        ljm.eWriteNames(
+            self._handle, len(self._config_names), self._config_names,
+            reg_datas
+            )
 
     def load_data(self, datas: tuple, buffer_type: str):
         """Load data array into stream-out buffer registers.
@@ -716,23 +1002,32 @@ class Streamer:
 
         Raises
         ------
+        TypeError
+            Input data is not a tuple of ``list``, ``tuple`` or
+            ``numpy.ndarray``.
         ValueError
-            Invalid buffer type
+            Invalid buffer type, more data arrays than stream-out targets or
+            a data array that isn't 1D.
         """
-        if isinstance(datas, tuple):
-            for d in datas:
-                if (
-                    not isinstance(d, tuple) and
-                    not isinstance(d, list) and
-                    not isinstance(d, np.ndarray)):
-                    raise TypeError(
-                        "Input data must be a tuple containing lists."
-                        )
+        if not isinstance(datas, tuple):
+            # a single stream-out target
+            datas = (datas,)
+
+        if not all(isinstance(d, (tuple, list, np.ndarray)) for d in datas):
+            raise TypeError("Input data must be a tuple containing lists.")
+        if len(datas) > len(self.out_names):
+            raise ValueError(
+                "{0} data arrays given for {1} stream-out targets".format(
+                    len(datas), len(self.out_names)
+                    )
+                )
 
         if buffer_type == "int":
-            buffer_name = "STREAM_OUT{0}_BUFFER_U16"
+            buffer_names = self._reg_names["buffer_u16"]
+            buffer_dtype = np.uint16
         elif buffer_type == "float":
-            buffer_name = "STREAM_OUT{0}_BUFFER_F32"
+            buffer_names = self._reg_names["buffer_f32"]
+            buffer_dtype = np.float32
         else:
             raise ValueError(
                 "Buffer type '{0}' is invalid - choose either 'int' or 'float'".format(
@@ -740,21 +1035,84 @@ class Streamer:
                     )
                 )
 
-        self._data_lengths = []
-
-        for stream_num, data in zip(self.stream_nums, datas):
-            ljm.eWriteNameArray(
-                self._handle, buffer_name.format(stream_num), len(data), data)
-            self._data_lengths.append(len(data))
+        # every input is converted once to the buffer type so values match
+        # the device buffer, whether given as a sequence or numpy.ndarray
+        datas = [np.asarray(data, dtype=buffer_dtype) for data in datas]
+        if any(data.ndim != 1 for data in datas):
+            raise ValueError(
+                "Each stream-out target must be given a 1D data array, pass "
+                "multiple targets as a tuple."
+                )
+        self._data_lengths = [data.size for data in datas]
+
+        # number of scans needed to stream-out every buffer
+        self._max_data_length = max(self._data_lengths, default=0)
+        # scan rate depends on the loaded data so must be prepared again
+        self._desired_scan_rate = None
+
+        # All buffers are packed into one contiguous array without boxing
+        # numpy data as Python floats
+        buffer_datas = np.empty(sum(self._data_lengths), dtype=np.float64)
+        start = 0
+        for data, data_length in zip(datas, self._data_lengths):
+            buffer_datas[start:start + data_length] = data
+            start += data_length
+
+        # All buffers are loaded in one transaction as array writes
+        num_buffers = len(self._data_lengths)
+        if _ljm_lib is None:
+            ljm.eNames(
+                self._handle, num_buffers, buffer_names[:num_buffers],
+                [1]*num_buffers, self._data_lengths, buffer_datas.tolist()
+                )
+        else:
+            # LJM reads the values straight from the numpy buffer
+            error_address = ctypes.c_int32(0)
+            error = _ljm_lib.LJM_eNames(
+                self._handle, num_buffers,
+                (ctypes.c_char_p*num_buffers)(
+                    *[name.encode("ascii") for name in buffer_names[:num_buffers]]
+                    ),
+                (ctypes.c_int32*num_buffers)(*[1]*num_buffers),
+                (ctypes.c_int32*num_buffers)(*self._data_lengths),
+                buffer_datas.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
+                ctypes.byref(error_address)
+                )
+            if error != ljm.errorcodes.NOERROR:
+                raise ljm.LJMError(error, error_address.value)
 
-    def start_stream(self, stream_time: float, scans_per_read: int=1) -> float:
-        """Stream-out loaded data to scan list at a given scan frequency.
+    def prepare(self, stream_time: float):
+        """Precompute the scan rate to stream-out loaded data over a given time.
 
         Parameters
         ----------
         stream_time : float
             Total time (in s) the stream will run for, converted into scan
             rate (Hz).
+
+        Raises
+        ------
+        ValueError
+            No data loaded into Streamer, data must be loaded in before
+            preparing.
+        """
+        if not self._max_data_length:
+            raise ValueError("Load some data in!")
+        self._desired_scan_rate = self._max_data_length / stream_time
+
+    def start_stream(
+        self, stream_time: float=None, scans_per_read: int=1) -> float:
+        """Stream-out loaded data to scan list at a given scan frequency.
+
+        Blocks until all loaded data has been streamed out, see
+        ``Streamer.start_stream_async`` and ``Streamer.wait_stream``.
+
+        Parameters
+        ----------
+        stream_time : float, optional
+            Total time (in s) the stream will run for, converted into scan
+            rate (Hz), by default None to use the scan rate from
+            ``Streamer.prepare``.
         scans_per_read : int, optional
             Number of times the stream targets or scan list is scanned per
             iteration, by default 1.
@@ -762,41 +1120,106 @@ class Streamer:
         Returns
         -------
         actual_time : float
-            Actual time the stream ran for which is 1.02x more than the
-            predicted stream-out time.
+            Actual time (in s) the stream ran for.
 
         Raises
         ------
         ValueError
-            No data loaded into Streamer, only needs to be loaded in once.
+            No data loaded into Streamer, only needs to be loaded in once, or
+            no stream time given or prepared.
         KeyboardInterrupt
             Streaming stopped by user
         """
-        try:
-            # determine scan rate based on loaded in data
-            scan_rate = max(self._data_lengths) / stream_time
-        except:
-            raise ValueError("Load some data in!")
-
-
         with self:
-            # stream actually starts here by setting STREAM_ENABLE=1 but doesn't
-            # block execution
-            actual_scan_rate = ljm.eStreamStart(
-                self._handle, scans_per_read,
-                len(self.scan_list), self.scan_list, scan_rate
-                )
-            # the sleep here is what blocks execution
-            # sleeping for 2% more time than stream out time just incase
-            actual_time = 1.02*(max(self._data_lengths) / actual_scan_rate)
-            time.sleep(actual_time)
+            expected_time = self.start_stream_async(stream_time, scans_per_read)
+            actual_time = self.wait_stream(expected_time)
 
             return actual_time
 
+    def start_stream_async(
+        self, stream_time: float=None, scans_per_read: int=1) -> float:
+        """Start streaming-out loaded data without blocking execution.
+
+        The stream must be stopped afterwards with ``Streamer.stop_stream`` or
+        by using the ``Streamer`` as a context manager.
+
+        Parameters
+        ----------
+        stream_time : float, optional
+            Total time (in s) the stream will run for, converted into scan
+            rate (Hz), by default None to use the scan rate from
+            ``Streamer.prepare``.
+        scans_per_read : int, optional
+            Number of times the stream targets or scan list is scanned per
+            iteration, by default 1.
+
+        Returns
+        -------
+        expected_time : float
+            Time (in s) the loaded data takes to stream-out at the actual scan
+            rate, see ``Streamer.wait_stream`` to block until it is done.
+
+        Raises
+        ------
+        ValueError
+            No data loaded into Streamer, only needs to be loaded in once, or
+            no stream time given or prepared.
+        """
+        if stream_time is not None:
+            self.prepare(stream_time)
+        elif self._desired_scan_rate is None:
+            raise ValueError("Prepare the stream time first!")
+
+        # stream actually starts here by setting STREAM_ENABLE=1 but doesn't
+        # block execution
+        actual_scan_rate = ljm.eStreamStart(
+            self._handle, scans_per_read,
+            len(self._scan_list), self._scan_list, self._desired_scan_rate
+            )
+        self._started = True
+        expected_time = self._max_data_length / actual_scan_rate
+
+        return expected_time
+
+    def wait_stream(
+        self, expected_time: float, poll_interval: float=1e-3) -> float:
+        """Block until all loaded data has been streamed out.
+
+        Sleeps for most of the expected stream time then polls the stream-out
+        buffers until they are empty, rather than padding the sleep.
+        ``ljm.eStreamRead`` can't be used to wait as LJM doesn't allow reading
+        from a stream with only stream-out channels in the scan list.
+
+        Parameters
+        ----------
+        expected_time : float
+            Time (in s) the stream is expected to take, see
+            ``Streamer.start_stream_async``.
+        poll_interval : float, optional
+            Time (in s) between polls of the stream-out buffers, by default
+            1e-3.
+
+        Returns
+        -------
+        actual_time : float
+            Time (in s) spent waiting for the stream to finish.
+        """
+        status_names = self._reg_names["buffer_status"]
+        num_status = len(status_names)
+
+        t_start = time.perf_counter()
+        time.sleep(0.95*expected_time)
+        while any(ljm.eReadNames(self._handle, num_status, status_names)):
+            time.sleep(poll_interval)
+
+        actual_time = time.perf_counter() - t_start
+        return actual_time
+
     def stop_stream(self):
         """Stop the stream."""
         try:
             ljm.eStreamStop(self._handle)
         except ljm.LJMError as e:
             if e.errorString != "STREAM_NOT_RUNNING":
-                pass
\ No newline at end of file
+                pass
+        self._started = False
\ No newline at end of file
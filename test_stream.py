@@ -2,6 +2,35 @@ from labjack import ljm
 import numpy as np
 
 import time
+from collections import namedtuple
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+StreamNames = namedtuple(
+    "StreamNames",
+    [
+        "stream_out", "buffer_size", "target", "enable", "loop_size", "set_loop",
+        "buffer_u16", "buffer_status"
+        ]
+    )
+
+STREAM_NAMES = [
+    StreamNames("STREAM_OUT{0}".format(stream_num), *[
+        "STREAM_OUT{0}_{1}".format(stream_num, suffix)
+        for suffix in [
+            "BUFFER_SIZE", "TARGET", "ENABLE", "LOOP_SIZE", "SET_LOOP", "BUFFER_U16",
+            "BUFFER_STATUS"
+            ]
+        ])
+    for stream_num in range(4)
+    ]
+"""Register names of each stream-out, built once at import."""
+
+DAC_ADDRESSES, DAC_TYPES = ljm.namesToAddresses(2, ["DAC0", "DAC1"])
+"""Addresses and data types of DAC0 and DAC1, resolved once at import."""
 
 def round_nearest_power_of_base(val, base, power=False):
     """
@@ -19,7 +48,15 @@ def round_nearest_power_of_base(val, base, power=False):
     ans : float
         base**rounded_power
     """
-    rounded_power = int(round(np.log(val) / np.log(base)))
+    if base == 2 and val >= 1 and val == int(val):
+        # power of 2 of an integer is its highest set bit, rounded up past
+        # the midpoint 2**(power + 0.5), i.e. val**2 > 2**(2*power + 1)
+        val = int(val)
+        rounded_power = val.bit_length() - 1
+        if val*val > 1 << (2*rounded_power + 1):
+            rounded_power += 1
+    else:
+        rounded_power = int(round(np.log(val) / np.log(base)))
     if power:
         ans = rounded_power
     else:
@@ -27,34 +64,82 @@ def round_nearest_power_of_base(val, base, power=False):
     return ans
 
 
+if njit is not None:
+    @njit(cache=True)
+    def _fill_sine_u16(out, amp, freq, phase, fs):
+        """Compiled ``fill_sine_u16``, generating and quantising in one loop."""
+        for i in range(out.size):
+            val = 32768.0 + amp*np.sin(2*np.pi*freq*np.float64(i)/fs + phase)
+            out[i] = np.uint16(min(max(np.rint(val), 0.0), 65535.0))
+
+
+def fill_sine_u16(out, amp, freq, phase, fs):
+    """
+    Fills a uint16 stream-out buffer with a sine wave centred at 32768.
+
+    Uses a compiled kernel when numba is installed, otherwise numpy. Both
+    round half to even so they fill identical buffers.
+
+    Parameters
+    ----------
+    out : numpy.ndarray
+        uint16 buffer to fill in place
+    amp : float
+        amplitude in binary DAC steps
+    freq : float
+        frequency of the sine wave in Hz
+    phase : float
+        phase in radians
+    fs : float
+        scan rate the buffer is streamed out at in Hz
+
+    Returns
+    -------
+    out : numpy.ndarray
+        the filled buffer
+    """
+    if njit is not None:
+        _fill_sine_u16(out, amp, freq, phase, fs)
+    else:
+        val = 32768.0 + amp*np.sin(2*np.pi*freq*np.arange(out.size)/fs + phase)
+        np.clip(np.rint(val), 0, 65535, out=val)
+        out[:] = val
+    return out
+
+
 def reset_dac(handle):
-    ljm.eWriteNames(handle, 2, ["DAC0", "DAC1", [0, 0]])
+    ljm.eWriteAddresses(handle, 2, DAC_ADDRESSES, DAC_TYPES, [0, 0])
 
 def init_stream(handle, stream_num, data, out_target, loop_size):
-    max_data_length = 0
-    scan_list = []
-    scan_list.append(ljm.nameToAddress("STREAM_OUT{0}".format(stream_num))[0])
-    max_data_length = len(data) if len(data) > max_data_length else max_data_length
-
-    if max_data_length > 2**14:
+    names = STREAM_NAMES[stream_num]
+    # stream-out and its target are resolved in one lookup
+    addresses = ljm.namesToAddresses(2, [names.stream_out, out_target])[0]
+    scan_list = [addresses[0]]
+    if len(data) > 2**14:
         raise ValueError
 
     buffer_size = 2**(round_nearest_power_of_base(len(data), 2, power=True) + 1)
     print("{0} buffer size and {1} data length".format(buffer_size, len(data)))
 
-    ljm.eWriteName(handle, "STREAM_OUT{0}_BUFFER_SIZE".format(stream_num), buffer_size)
-    ljm.eWriteName(handle, "STREAM_OUT{0}_TARGET".format(stream_num), ljm.nameToAddress(out_target)[0])
-    ljm.eWriteName(handle, "STREAM_OUT{0}_ENABLE".format(stream_num), 1)
-    ljm.eWriteName(handle, "STREAM_OUT{0}_LOOP_SIZE".format(stream_num), loop_size)
-    ljm.eWriteName(handle, "STREAM_OUT{0}_SET_LOOP".format(stream_num), 1)
+    # all configuration registers are written in one transaction
+    config_names = [
+        names.buffer_size, names.target, names.enable, names.loop_size, names.set_loop
+        ]
+    config_vals = [buffer_size, addresses[1], 1, loop_size, 1]
+    ljm.eWriteNames(handle, len(config_names), config_names, config_vals)
 
-    ljm.eWriteNameArray(handle, "STREAM_OUT{0}_BUFFER_U16".format(stream_num), len(data), data)
+    # converted to a list in C once, rather than LJM iterating the array
+    data = np.ascontiguousarray(data, dtype=np.uint16).tolist()
+    ljm.eWriteNameArray(handle, names.buffer_u16, len(data), data)
 
     return scan_list
 
-def test_buffer_size(handle):
-    data_1 = np.arange(0, int(2**16), 25)
-    data_2 = np.repeat(np.arange(0, int(2**16), 25), 2)
+def test_buffer_size(handle, sleep_override=None):
+    data_1 = np.arange(0, int(2**16), 25, dtype=np.uint16)
+    # each value of data_1 twice, filled in place by strided assignment
+    data_2 = np.empty(2*data_1.size, dtype=np.uint16)
+    data_2[0::2] = data_1
+    data_2[1::2] = data_1
 
     print("data_1 len: {0}, first: {1}, last: {2}".format(len(data_1), data_1[0], data_1[-1]))
     print("data_2 len: {0}, first: {1}, last: {2}".format(len(data_2), data_2[0], data_2[-1]))
@@ -65,32 +150,27 @@ def test_buffer_size(handle):
 
     reset_dac(handle)
 
-    slp = 1.02*(max([len(data_2), len(data_1)]) / scan_rate)
+    if sleep_override is None:
+        slp = 1.02*(max(len(data_2), len(data_1)) / scan_rate)
+    else:
+        slp = sleep_override
 
     print("time: {0}s".format(slp))
-    user = input("default or custom sleep time? ")
-    try:
-        slp = int(user)
-    except:
-        print("quiting")
 
-    if user != "q":
-        print("default sleep time!")
-
-        try:
-            ljm.eStreamStart(handle, 1, len(scan_list), scan_list, scan_rate)
-            time.sleep(slp)
+    try:
+        ljm.eStreamStart(handle, 1, len(scan_list), scan_list, scan_rate)
+        time.sleep(slp)
 
-        except ljm.LJMError:
-            print("error")
+    except ljm.LJMError:
+        print("error")
 
-        reset_dac(handle)
-        ljm.eStreamStop(handle)
-        ljm.close(handle)
+    reset_dac(handle)
+    ljm.eStreamStop(handle)
+    ljm.close(handle)
 
 def test_stream_time(handle):
     reset_dac(handle)
-    full_data = np.arange(0, int(2**16), 1)
+    full_data = np.arange(0, int(2**16), 1, dtype=np.uint16)
     chunk_size = 2**13 - 1
     print("full_data len: {0}, first: {1}, last: {2}".format(len(full_data), full_data[0], full_data[-1]))
     scan_rate = 1000
@@ -103,26 +183,18 @@ def test_stream_time(handle):
     try:
         print("starting scan no. 1")
         ljm.eStreamStart(handle, 1, len(scan_list), scan_list, scan_rate)
+        # timed wait as LJM can't eStreamRead a stream-out only scan list
         time.sleep(0.5)
-        buffer_status = ljm.eReadName(handle, "STREAM_OUT0_BUFFER_STATUS")
+        buffer_status = ljm.eReadName(handle, STREAM_NAMES[0].buffer_status)
         print(buffer_status)
         time.sleep(slp)
 
-
-        # while True:
-        #     buffer_status = ljm.eReadName(handle, "STREAM_OUT0_BUFFER_STATUS")
-        #     time.sleep(1/scan_rate)
-
-
         # for i, bit in enumerate([12, 13, 14, 15]):
         #     print("starting scan no. {0}".format(i + 2))
         #     ljm.eWriteNameArray(
-        #         handle, "STREAM_OUT{0}_BUFFER_U16".format(0),
+        #         handle, STREAM_NAMES[0].buffer_u16,
         #         len(full_data[2**bit: 2**(bit + 1)]), full_data[2**bit: 2**(bit + 1)])
 
-        #     while True:
-
-
     except ljm.LJMError:
         print("error'")
 